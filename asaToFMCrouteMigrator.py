@@ -1,170 +1,591 @@
 #!/usr/bin/env python3
+import argparse
+import logging
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import mmap
+import os
+import re
+import socket
 import sys
+import threading
 import time
 from typing import List, Dict, Set
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import urllib3
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Prefer orjson for API payloads when available
+try:
+    import orjson
+    _loads = orjson.loads
+    json_dumps = orjson.dumps
+    def json_pretty(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    _loads = json.loads
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+    def json_pretty(obj) -> str:
+        return json.dumps(obj, indent=2)
+
+def json_loads(data: bytes):
+    """Decode a response body, raising requests' JSONDecodeError like response.json() does"""
+    try:
+        return _loads(data)
+    except ValueError as e:
+        # Also a RequestException, so the existing error handlers still catch bad bodies
+        raise requests.exceptions.JSONDecodeError(getattr(e, 'msg', str(e)), getattr(e, 'doc', ''), getattr(e, 'pos', 0)) from e
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of requests in flight at once (also the connection pool size)
+DEPLOY_WORKERS = 10
+
+# Number of routes sent per bulk POST
+BULK_CHUNK_SIZE = 100
+
+# Number of objects sent per bulk create POST (API maximum)
+OBJECT_BULK_CHUNK_SIZE = 1000
+
+# Page size for FMC object listings (API maximum)
+PAGE_LIMIT = 1000
+
+# Request rate limits (requests/second) and retries on HTTP 429
+RATE_LIMIT_START = 2.0
+RATE_LIMIT_MIN = 0.5
+RATE_LIMIT_MAX = 10.0
+MAX_RETRIES = 5
+
+# Seconds to wait for a connection / for a response (bulk creates can be slow)
+REQUEST_TIMEOUT = (10, 120)
+
+# FMC access tokens last 30 minutes and can be refreshed 3 times before a new login is required
+TOKEN_REFRESH_INTERVAL = 25 * 60
+TOKEN_RETRY_INTERVAL = 60
+MAX_TOKEN_REFRESHES = 3
+
+# Dotted-quad netmask to prefix length
+NETMASK_TO_PREFIX = {
+    '.'.join(str((0xffffffff << (32 - p) >> shift) & 0xff) for shift in (24, 16, 8, 0)): p
+    for p in range(33)
+}
+
+# ASA static route: route <interface> <network> <netmask> <gateway> <metric>
+ROUTE_PATTERN = re.compile(
+    rb'^[ \t]*route[ \t]+(\S+)[ \t]+(\S+)[ \t]+(\S+)[ \t]+(\S+)[ \t]+(\d+)[ \t\r]*$',
+    re.M
+)
+
+class FMCAdapter(HTTPAdapter):
+    """HTTPAdapter that disables Nagle and enables TCP keepalive on FMC connections"""
+    SOCKET_OPTIONS = [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = self.SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+class RateLimiter:
+    """Thread-safe token bucket that backs off on HTTP 429 and recovers on success"""
+    def __init__(self, rate: float, min_rate: float, max_rate: float):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take a token, sleeping only if the bucket is empty"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(max(self.rate, 1.0), self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+    def backoff(self) -> None:
+        """Halve the rate after FMC signals it is overloaded"""
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def success(self) -> None:
+        """Slowly raise the rate back towards the cap"""
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + 0.1)
+
 class FMCRouteConverter:
-    def __init__(self, fmc_host: str, username: str, password: str):
+    # Fields common to every static route sent to FMC
+    _ROUTE_TEMPLATE = {"type": "IPv4StaticRoute", "isTunneled": False}
+
+    def __init__(self, fmc_host: str, username: str, password: str, debug: bool = False):
         self.fmc_host = fmc_host
         self.username = username
         self.password = password
+        self.debug = debug
         self.headers = None
+        self.refresh_token = None
         self.domain_uuid = None
         self.device_id = None
+        self._refreshes = 0
+        self._refresh_timer = None
+
+        # Single keep-alive session reused for every FMC call
+        self.session = requests.Session()
+        self.session.verify = False
+        # Block for a free connection rather than opening throwaway sockets beyond the pool
+        self.session.mount(f"https://{fmc_host}", FMCAdapter(pool_connections=1, pool_maxsize=DEPLOY_WORKERS, pool_block=True))
+        self.limiter = RateLimiter(RATE_LIMIT_START, RATE_LIMIT_MIN, RATE_LIMIT_MAX)
         
         # Cache for network/host objects
         self.network_objects = {}
         self.host_objects = {}
 
+        # Objects indexed by address value
+        self._by_value_host = {}
+        self._by_value_net = {}
+
+        # Compact object references keyed by object id, shared between routes
+        self._ref_cache = {}
+
+        # Parsed ASA routes, and objects/routes waiting on confirmation before creation
+        self._parsed = []
+        self.pending_hosts = []
+        self.pending_networks = []
+        self.pending_routes = 0
+
+    def _set_tokens(self, response: requests.Response) -> None:
+        """Store the access/refresh tokens from an FMC auth response"""
+        self.headers = {
+            'X-auth-access-token': response.headers.get('X-auth-access-token'),
+            'Content-Type': 'application/json'
+        }
+        self.session.headers.update(self.headers)
+        self.refresh_token = response.headers.get('X-auth-refresh-token', self.refresh_token)
+
+    def _schedule_refresh(self, delay: float = TOKEN_REFRESH_INTERVAL) -> None:
+        """Refresh the access token in the background before it expires"""
+        self._refresh_timer = threading.Timer(delay, self._refresh_token)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def _generate_token(self) -> requests.Response:
+        """Log in again for a fresh access/refresh token pair"""
+        response = self.session.post(
+            f"https://{self.fmc_host}/api/fmc_platform/v1/auth/generatetoken",
+            auth=(self.username, self.password),
+            timeout=REQUEST_TIMEOUT
+        )
+        response.raise_for_status()
+        self._refreshes = 0
+        return response
+
+    def _refresh_token(self) -> None:
+        """Refresh the access token, logging in again once refreshes are used up or fail"""
+        try:
+            response = None
+            if self._refreshes < MAX_TOKEN_REFRESHES:
+                try:
+                    response = self.session.post(
+                        f"https://{self.fmc_host}/api/fmc_platform/v1/auth/refreshtoken",
+                        headers={'X-auth-refresh-token': self.refresh_token},
+                        timeout=REQUEST_TIMEOUT
+                    )
+                    response.raise_for_status()
+                    self._refreshes += 1
+                except requests.exceptions.RequestException as e:
+                    print(f"Error refreshing FMC access token ({e}), logging in again...")
+                    response = None
+            if response is None:
+                response = self._generate_token()
+            self._set_tokens(response)
+            logger.debug("Refreshed FMC access token")
+        except requests.exceptions.RequestException as e:
+            # Retry well before the current token expires
+            print(f"Error logging in to FMC to renew the access token: {e}")
+            self._schedule_refresh(TOKEN_RETRY_INTERVAL)
+            return
+        self._schedule_refresh()
+
     def login(self) -> None:
         """Authenticate to FMC and get access token"""
         auth_url = f"https://{self.fmc_host}/api/fmc_platform/v1/auth/generatetoken"
         try:
-            response = requests.post(
+            response = self.session.post(
                 auth_url,
                 auth=(self.username, self.password),
-                verify=False
+                timeout=REQUEST_TIMEOUT
             )
             response.raise_for_status()
-            self.headers = {
-                'X-auth-access-token': response.headers.get('X-auth-access-token'),
-                'Content-Type': 'application/json'
-            }
+            self._set_tokens(response)
             self.domain_uuid = response.headers.get('DOMAIN_UUID')
         except requests.exceptions.RequestException as e:
             print(f"Error authenticating to FMC: {e}")
             sys.exit(1)
+        self._schedule_refresh()
+
+    def close(self) -> None:
+        """Stop background token refresh and release pooled connections"""
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+        self.session.close()
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a rate-limited request, honoring Retry-After on HTTP 429"""
+        for attempt in range(MAX_RETRIES + 1):
+            self.limiter.acquire()
+            response = self.session.request(method, url, timeout=REQUEST_TIMEOUT, **kwargs)
+            if response.status_code != 429:
+                if response.ok:
+                    self.limiter.success()
+                return response
+            
+            self.limiter.backoff()
+            if attempt == MAX_RETRIES:
+                break
+            retry_after = response.headers.get('Retry-After', '')
+            time.sleep(float(retry_after) if retry_after.isdigit() else 2 ** attempt)
+        return response
+
+    @staticmethod
+    def _match_device(devices: List[Dict], device_name: str) -> str:
+        """Return the ID of the device named exactly device_name, or None"""
+        for device in devices:
+            if device['name'] == device_name:
+                return device['id']
+        return None
 
     def get_device_id(self, device_name: str) -> None:
         """Get the device ID for the specified FTD device"""
         url = f"https://{self.fmc_host}/api/fmc_config/v1/domain/{self.domain_uuid}/devices/devicerecords"
         try:
-            response = requests.get(url, headers=self.headers, verify=False)
-            response.raise_for_status()
-            devices = response.json().get('items', [])
-            for device in devices:
-                if device['name'] == device_name:
-                    self.device_id = device['id']
-                    return
+            # Let FMC filter by name; older versions reject or ignore the filter
+            response = self._request('GET', url, params={'filter': f"name:{device_name}", 'expanded': 'false'})
+            devices = json_loads(response.content).get('items', []) if response.ok else []
+            device_id = self._match_device(devices, device_name)
+            if device_id is None:
+                # Filter rejected or ignored (only the first page came back): scan every record
+                device_id = self._match_device(self._get_all_items(url), device_name)
+            if device_id is not None:
+                self.device_id = device_id
+                return
             print(f"Device {device_name} not found")
             sys.exit(1)
         except requests.exceptions.RequestException as e:
             print(f"Error getting device ID: {e}")
             sys.exit(1)
 
-    def get_existing_objects(self) -> None:
-        """Get existing network/host objects from FMC"""
-        print("Fetching existing network objects...")
+    def _get_all_items(self, url: str, expanded: bool = False) -> List[Dict]:
+        """Fetch every page of a paginated FMC listing, remaining pages in parallel"""
+        expanded = 'true' if expanded else 'false'
+        response = self._request('GET', url, params={'limit': PAGE_LIMIT, 'offset': 0, 'expanded': expanded})
+        response.raise_for_status()
+        data = json_loads(response.content)
+        items = data.get('items', [])
+        
+        pages = data.get('paging', {}).get('pages', 1)
+        if pages > 1:
+            def fetch_page(offset: int) -> List[Dict]:
+                page = self._request('GET', url, params={'limit': PAGE_LIMIT, 'offset': offset, 'expanded': expanded})
+                page.raise_for_status()
+                return json_loads(page.content).get('items', [])
+            
+            offsets = range(PAGE_LIMIT, pages * PAGE_LIMIT, PAGE_LIMIT)
+            with ThreadPoolExecutor(max_workers=DEPLOY_WORKERS) as pool:
+                for page_items in pool.map(fetch_page, offsets):
+                    items.extend(page_items)
         
-        # Get network objects
-        url = f"https://{self.fmc_host}/api/fmc_config/v1/domain/{self.domain_uuid}/object/networks?limit=1000"
+        return items
+
+    def _fetch_objects(self, kind: str, cache: Dict, expanded: bool = False) -> None:
+        """Fetch all objects of one kind ('networks' or 'hosts') into cache, keyed by name"""
+        url = f"https://{self.fmc_host}/api/fmc_config/v1/domain/{self.domain_uuid}/object/{kind}"
         try:
-            response = requests.get(url, headers=self.headers, verify=False)
-            response.raise_for_status()
-            for obj in response.json().get('items', []):
+            for obj in self._get_all_items(url, expanded):
                 if 'name' in obj:
-                    key = f"{obj['name']}"
-                    self.network_objects[key] = obj
-                    print(f"Found network object: {obj['name']}")
+                    cache[obj['name']] = {k: obj[k] for k in ('id', 'type', 'name', 'value') if k in obj}
+                    logger.debug(f"Found {kind[:-1]} object: {obj['name']}")
         except requests.exceptions.RequestException as e:
-            print(f"Error getting network objects: {e}")
+            print(f"Error getting {kind[:-1]} objects: {e}")
 
-        print("\nFetching existing host objects...")
+    def get_existing_objects(self) -> None:
+        """Get existing network/host objects from FMC"""
+        print("Fetching existing network and host objects...")
         
-        # Get host objects
-        url = f"https://{self.fmc_host}/api/fmc_config/v1/domain/{self.domain_uuid}/object/hosts?limit=1000"
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [
+                pool.submit(self._fetch_objects, 'networks', self.network_objects),
+                pool.submit(self._fetch_objects, 'hosts', self.host_objects),
+            ]
+            for future in futures:
+                future.result()
+            
+        print(f"\nTotal objects found: {len(self.network_objects)} networks, {len(self.host_objects)} hosts")
+        self._build_indexes()
+
+    def _lookup_objects(self, kind: str, value: str) -> List[Dict]:
+        """Fetch fully expanded objects of one kind matching an address"""
+        url = f"https://{self.fmc_host}/api/fmc_config/v1/domain/{self.domain_uuid}/object/{kind}"
         try:
-            response = requests.get(url, headers=self.headers, verify=False)
+            response = self._request('GET', url, params={'filter': f"nameOrValue:{value}", 'expanded': 'true'})
             response.raise_for_status()
-            for obj in response.json().get('items', []):
-                if 'name' in obj:
-                    self.host_objects[obj['name']] = obj
-                    print(f"Found host object: {obj['name']}")
+            return json_loads(response.content).get('items', [])
         except requests.exceptions.RequestException as e:
-            print(f"Error getting host objects: {e}")
-            
-        print(f"\nTotal objects found: {len(self.network_objects)} networks, {len(self.host_objects)} hosts")
+            print(f"Error looking up {kind[:-1]} object for {value}: {e}")
+            return []
 
-    def find_or_create_object(self, value: str, mask: str = None) -> Dict:
-        """Find existing object by value/mask or return None"""
-        is_host = mask == '255.255.255.255' or mask is None
+    def _hydrate_objects(self, parsed: List[tuple]) -> None:
+        """Fetch values only for addresses the unexpanded listings could not resolve"""
+        hosts = set()
+        networks = set()
+        for _, network, netmask, gateway, _ in parsed:
+            if self._find_host(gateway) is None:
+                hosts.add(gateway)
+            if self._find_network(network, netmask) is None:
+                (hosts if netmask == '255.255.255.255' else networks).add(network)
+        if not hosts and not networks:
+            return
         
-        # Determine which cache to use
-        cache = self.host_objects if is_host else self.network_objects
-        cache_key = "obj-" + value if is_host else ("obj-" + value)
+        # One targeted GET per address is only cheaper while it needs fewer requests than
+        # re-reading the whole listing expanded, so switch to the listing past that point
+        jobs = []
+        for kind, cache, values in (('hosts', self.host_objects, hosts), ('networks', self.network_objects, networks)):
+            pages = max(1, -(-len(cache) // PAGE_LIMIT))
+            if len(values) > pages:
+                print(f"Fetching expanded {kind[:-1]} objects to resolve {len(values)} addresses...")
+                self._fetch_objects(kind, cache, expanded=True)
+            else:
+                jobs.extend((kind, value) for value in values)
         
-        # Look for existing object
-        if cache_key in cache:
-            print(f"Found existing object: {cache[cache_key]['name']} for {value}")
-            return cache[cache_key]
-        
-        print(f"Warning: No existing object found for {value}")
-        return None
+        if jobs:
+            print(f"Looking up {len(jobs)} addresses in FMC...")
+            with ThreadPoolExecutor(max_workers=DEPLOY_WORKERS) as pool:
+                for (kind, _), items in zip(jobs, pool.map(lambda job: self._lookup_objects(*job), jobs)):
+                    cache = self.host_objects if kind == 'hosts' else self.network_objects
+                    for obj in items:
+                        cache[obj['name']] = obj
+        self._build_indexes()
 
-    def parse_and_prepare_routes(self, filename: str) -> List[Dict]:
-        """Parse ASA routes and prepare FMC route objects"""
+    def bootstrap(self, device_name: str) -> None:
+        """Resolve the device ID and fetch existing objects concurrently"""
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            device = pool.submit(self.get_device_id, device_name)
+            self.get_existing_objects()
+            device.result()
+
+    def _build_indexes(self) -> None:
+        """Index cached objects by their address value for O(1) lookups"""
+        self._by_value_host = {o['value']: o for o in self.host_objects.values() if 'value' in o}
+        # Host objects also satisfy /32 network lookups
+        self._by_value_net = {(value, 32): obj for value, obj in self._by_value_host.items()}
+        for obj in self.network_objects.values():
+            if 'value' in obj:
+                address, _, prefix = obj['value'].partition('/')
+                self._by_value_net[(address, int(prefix) if prefix else None)] = obj
+
+    @staticmethod
+    def _object_name(address: str, prefix: int = 32) -> str:
+        """Name used for objects this script creates and looks up: obj-<address>[_<prefix>]"""
+        return f"obj-{address}" if prefix == 32 else f"obj-{address}_{prefix}"
+
+    def _find_host(self, value: str) -> Dict:
+        """Find existing host object by address or return None"""
+        obj = self._by_value_host.get(value)
+        if obj is None:
+            # Fall back to the naming convention and remember the hit
+            obj = self.host_objects.get(self._object_name(value))
+            if obj is not None:
+                self._by_value_host[value] = obj
+        return obj
+
+    def _find_network(self, value: str, mask: str) -> Dict:
+        """Find existing network object by address/netmask or return None"""
+        prefix = NETMASK_TO_PREFIX.get(mask)
+        key = (value, prefix)
+        obj = self._by_value_net.get(key)
+        if obj is None:
+            # /32 networks are host objects; otherwise fall back to the naming convention
+            if prefix == 32:
+                obj = self._find_host(value)
+            elif prefix is not None:
+                obj = self.network_objects.get(self._object_name(value, prefix))
+            if obj is not None:
+                self._by_value_net[key] = obj
+        return obj
+
+    def _ref(self, obj: Dict) -> Dict:
+        """Return the shared {type, id, name} reference for an object"""
+        ref = self._ref_cache.get(obj['id'])
+        if ref is None:
+            ref = self._ref_cache[obj['id']] = {
+                "type": obj['type'],
+                "id": obj['id'],
+                "name": obj['name']
+            }
+        return ref
+
+    @staticmethod
+    def _read_routes(filename: str):
+        """Yield (interface, network, netmask, gateway, metric) for each ASA route line"""
+        with open(filename, 'rb') as f:
+            # mmap cannot map an empty file
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for match in ROUTE_PATTERN.finditer(data):
+                    interface, network, netmask, gateway, metric = (g.decode() for g in match.groups())
+                    yield interface, network, netmask, gateway, int(metric)
+
+    def _build_routes(self, parsed: List[tuple]) -> tuple:
+        """Build FMC route objects, returning (routes, missing_objects, unresolved_routes)"""
         routes = []
         missing_objects = set()
+        unresolved = set()
+        seen = set()
         
-        print("\nParsing routes and matching objects...")
-        with open(filename, 'r') as f:
-            for line in f:
-                parts = line.strip().split()
-                if len(parts) == 6 and parts[0] == 'route':
-                    interface = parts[1]
-                    network = parts[2]
-                    netmask = parts[3]
-                    gateway = parts[4]
-                    metric = int(parts[5])
-
-                    # Find gateway object
-                    gw_obj = self.find_or_create_object(gateway)
-                    if not gw_obj:
-                        missing_objects.add(f"Gateway: {gateway}")
-                        continue
-                    
-                    # Find network object
-                    net_obj = self.find_or_create_object(network, netmask)
-                    if not net_obj:
-                        missing_objects.add(f"Network: {network}/{netmask}")
-                        continue
-
-                    # Create route object
-                    route = {
-                        "interfaceName": interface,
-                        "selectedNetworks": [{
-                            "type": net_obj['type'],
-                            "id": net_obj['id'],
-                            "name": net_obj['name']
-                        }],
-                        "gateway": {
-                            "object": {
-                                "type": gw_obj['type'],
-                                "id": gw_obj['id'],
-                                "name": gw_obj['name']
-                            }
-                        },
-                        "metricValue": metric,
-                        "type": "IPv4StaticRoute",
-                        "isTunneled": False
-                    }
-                    routes.append(route)
-                    print(f"Prepared route: {network}/{netmask} via {gateway}")
+        for interface, network, netmask, gateway, metric in parsed:
+            # Find gateway object
+            gw_obj = self._find_host(gateway)
+            if not gw_obj:
+                missing_objects.add(("Gateway", gateway))
+            
+            # Find network object
+            net_obj = self._find_network(network, netmask)
+            if not net_obj:
+                missing_objects.add(("Network", network, netmask))
+            
+            if not gw_obj or not net_obj:
+                unresolved.add((interface, network, netmask, gateway, metric))
+                continue
+
+            # Skip routes repeated in the ASA config
+            key = (interface, net_obj['id'], gw_obj['id'], metric)
+            if key in seen:
+                logger.debug(f"Skipping duplicate route: {network}/{netmask} via {gateway}")
+                continue
+            seen.add(key)
+
+            # Create route object
+            route = {
+                **self._ROUTE_TEMPLATE,
+                "interfaceName": interface,
+                "selectedNetworks": [self._ref(net_obj)],
+                "gateway": {"object": self._ref(gw_obj)},
+                "metricValue": metric
+            }
+            routes.append(route)
+            logger.debug(f"Prepared route: {network}/{netmask} via {gateway}")
 
+        return routes, missing_objects, unresolved
+
+    def _create_objects(self, kind: str, objects: List[Dict]) -> None:
+        """Create objects of one kind ('networks' or 'hosts') with bulk POSTs and cache them"""
+        url = f"https://{self.fmc_host}/api/fmc_config/v1/domain/{self.domain_uuid}/object/{kind}"
+        cache = self.host_objects if kind == 'hosts' else self.network_objects
+        for i in range(0, len(objects), OBJECT_BULK_CHUNK_SIZE):
+            chunk = objects[i:i + OBJECT_BULK_CHUNK_SIZE]
+            try:
+                response = self._request('POST', url, params={'bulk': 'true'}, data=json_dumps(chunk))
+                response.raise_for_status()
+                created = json_loads(response.content).get('items', [])
+            except requests.exceptions.RequestException as e:
+                print(f"Error creating {len(chunk)} {kind[:-1]} objects: {e}")
+                if e.response is not None:
+                    for message in self._error_messages(e.response):
+                        print(f"  - {message}")
+                continue
+            for obj in created:
+                cache[obj['name']] = obj
+                logger.debug(f"Created {kind[:-1]} object: {obj['name']}")
+
+    def _plan_missing_objects(self, missing_objects: Set[tuple]) -> Set[tuple]:
+        """Queue host/network objects for every missing address, returning those that cannot be created"""
+        hosts = set()
+        networks = {}
+        invalid = set()
+        for kind, address, *mask in missing_objects:
+            if kind == "Gateway" or mask[0] == '255.255.255.255':
+                hosts.add(address)
+            elif mask[0] in NETMASK_TO_PREFIX:
+                prefix = NETMASK_TO_PREFIX[mask[0]]
+                networks[(address, prefix)] = {"name": self._object_name(address, prefix), "value": f"{address}/{prefix}", "type": "Network"}
+            else:
+                invalid.add((kind, address, *mask))
+        self.pending_hosts = [{"name": self._object_name(value), "value": value, "type": "Host"} for value in sorted(hosts)]
+        self.pending_networks = [networks[key] for key in sorted(networks)]
+        return invalid
+
+    def create_missing_objects(self) -> List[Dict]:
+        """Create the queued host/network objects in FMC and return the full route list"""
+        print(f"\nCreating {len(self.pending_hosts)} host and {len(self.pending_networks)} network objects in FMC...")
+        self._create_objects('hosts', self.pending_hosts)
+        self._create_objects('networks', self.pending_networks)
+        self._build_indexes()
+        self.pending_hosts = []
+        self.pending_networks = []
+        
+        routes, missing_objects, _ = self._build_routes(self._parsed)
         if missing_objects:
-            print("\nWARNING: The following objects were not found in FMC:")
-            for obj in sorted(missing_objects):
-                print(f"  - {obj}")
+            print("\nWARNING: The following objects could not be created in FMC:")
+            for kind, *rest in sorted(missing_objects):
+                print(f"  - {kind}: {'/'.join(rest)}")
             print("\nPlease create these objects in FMC before proceeding.")
             sys.exit(1)
+        return routes
+
+    def parse_and_prepare_routes(self, filename: str) -> List[Dict]:
+        """Parse ASA routes and prepare FMC route objects, queueing any objects that must be created"""
+        print("\nParsing routes and matching objects...")
+        self._parsed = list(self._read_routes(filename))
+        self._hydrate_objects(self._parsed)
+        routes, missing_objects, unresolved = self._build_routes(self._parsed)
+        self.pending_routes = len(unresolved)
+
+        print(f"Prepared {len(routes)} routes")
+
+        if missing_objects:
+            invalid = self._plan_missing_objects(missing_objects)
+            if invalid:
+                print("\nWARNING: The following objects were not found in FMC and cannot be created:")
+                for kind, *rest in sorted(invalid):
+                    print(f"  - {kind}: {'/'.join(rest)}")
+                print("\nPlease create these objects in FMC before proceeding.")
+                sys.exit(1)
 
         return routes
 
+    def _post_routes(self, url: str, chunk: List[Dict]) -> None:
+        """POST a chunk of routes to FMC in a single bulk request"""
+        response = self._request('POST', url, params={'bulk': 'true'}, data=json_dumps(chunk))
+        response.raise_for_status()
+
+    def _post_route(self, url: str, route: Dict) -> None:
+        """POST a single route to FMC"""
+        response = self._request('POST', url, data=json_dumps(route))
+        response.raise_for_status()
+
+    @staticmethod
+    def _error_messages(response: requests.Response) -> List[str]:
+        """Extract error descriptions from an FMC error response body"""
+        try:
+            messages = json_loads(response.content).get('error', {}).get('messages', [])
+        except ValueError:
+            return [response.text]
+        return [m.get('description', '') for m in messages]
+
+    @staticmethod
+    def _is_validation_error(e: requests.exceptions.RequestException) -> bool:
+        """True if FMC rejected the request outright (4xx other than 429), so nothing was created"""
+        return (isinstance(e, requests.exceptions.HTTPError) and e.response is not None
+                and 400 <= e.response.status_code < 500 and e.response.status_code != 429)
+
     def deploy_routes(self, routes: List[Dict]) -> None:
         """Deploy routes to FTD via FMC API"""
         url = f"https://{self.fmc_host}/api/fmc_config/v1/domain/{self.domain_uuid}/devices/devicerecords/{self.device_id}/routing/ipv4staticroutes"
@@ -172,23 +593,65 @@ class FMCRouteConverter:
         total = len(routes)
         print(f"\nDeploying {total} routes...")
         
-        for i, route in enumerate(routes, 1):
-            try:
-                response = requests.post(url, headers=self.headers, json=route, verify=False)
-                response.raise_for_status()
-                print(f"[{i}/{total}] Successfully deployed route to {route['selectedNetworks'][0]['name']}")
-                
-                # Add small delay every 10 routes to avoid overwhelming the API
-                if i % 10 == 0:
-                    time.sleep(1)
-                    
-            except requests.exceptions.RequestException as e:
-                print(f"Error deploying route to {route['selectedNetworks'][0]['name']}: {e}")
-                print(f"Failed route details: {json.dumps(route, indent=2)}")
-                print("\nStopping deployment due to error.")
-                sys.exit(1)
+        chunks = [routes[i:i + BULK_CHUNK_SIZE] for i in range(0, total, BULK_CHUNK_SIZE)]
+        retry = []
+        failures = []
+        deployed = 0
+        
+        with ThreadPoolExecutor(max_workers=DEPLOY_WORKERS) as pool:
+            futures = {pool.submit(self._post_routes, url, chunk): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    future.result()
+                except requests.exceptions.RequestException as e:
+                    if self._is_validation_error(e):
+                        print(f"Bulk request for {len(chunk)} routes failed ({e}), retrying them individually...")
+                        retry.extend(chunk)
+                    else:
+                        # FMC may have created the chunk already, so resending risks duplicate routes
+                        print(f"Bulk request for {len(chunk)} routes failed ({e}), not retrying: check FMC for partially created routes")
+                        failures.extend((route, e) for route in chunk)
+                    continue
+                deployed += len(chunk)
+                for route in chunk:
+                    logger.debug(f"Deployed route to {route['selectedNetworks'][0]['name']}")
+            
+            # Isolate the bad routes in failed chunks so the rest still get created
+            futures = {pool.submit(self._post_route, url, route): route for route in retry}
+            for future in as_completed(futures):
+                route = futures[future]
+                try:
+                    future.result()
+                except requests.exceptions.RequestException as e:
+                    failures.append((route, e))
+                    continue
+                deployed += 1
+                logger.debug(f"Deployed route to {route['selectedNetworks'][0]['name']}")
+        
+        print(f"\nDeployed {deployed}/{total} routes")
+        if failures:
+            print(f"\n{len(failures)} routes failed to deploy:")
+            for route, e in failures:
+                status = e.response.status_code if e.response is not None else "no response"
+                print(f"Error deploying route to {route['selectedNetworks'][0]['name']}: HTTP {status}")
+                if e.response is not None:
+                    for message in self._error_messages(e.response):
+                        print(f"  - {message}")
+                if self.debug:
+                    logger.debug(f"Failed route details: {json_pretty(route)}")
+            sys.exit(1)
 
 def main():
+    parser = argparse.ArgumentParser(description="Migrate ASA static routes to an FTD device via FMC")
+    parser.add_argument('-v', '--verbose', action='store_true', help="log every object and route processed")
+    parser.add_argument('--debug', action='store_true', help="like --verbose, and dump the full body of failed routes")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+    if args.verbose or args.debug:
+        # Only this script's messages; keep urllib3's connection chatter quiet
+        logger.setLevel(logging.DEBUG)
+
     # Configuration parameters
     FMC_HOST = "fmc_ip_addr"  # Replace with actual FMC hostname/IP
     USERNAME = "username"  # Replace with actual username
@@ -197,35 +660,45 @@ def main():
     ROUTES_FILE = "asa-routes.txt"  # Replace with actual file path
 
     # Initialize FMC API client
-    fmc = FMCRouteConverter(FMC_HOST, USERNAME, PASSWORD)
+    fmc = FMCRouteConverter(FMC_HOST, USERNAME, PASSWORD, debug=args.debug)
     
     # Login to FMC
     print("Logging in to FMC...")
     fmc.login()
     
-    # Get device ID
-    print(f"Getting device ID for {DEVICE_NAME}...")
-    fmc.get_device_id(DEVICE_NAME)
-    
-    # Get existing objects
-    print("Getting existing network objects...")
-    fmc.get_existing_objects()
-    
-    # Parse routes and prepare them
-    print("Parsing and preparing routes...")
-    routes = fmc.parse_and_prepare_routes(ROUTES_FILE)
-    
-    # Confirm deployment
-    print(f"\nReady to deploy {len(routes)} routes.")
-    confirm = input("Do you want to proceed? (yes/no): ")
-    if confirm.lower() != 'yes':
-        print("Deployment cancelled.")
-        sys.exit(0)
-    
-    # Deploy routes
-    fmc.deploy_routes(routes)
-    
-    print("\nRoute deployment complete!")
+    try:
+        # Get device ID and existing objects
+        print(f"Getting device ID for {DEVICE_NAME} and existing objects...")
+        fmc.bootstrap(DEVICE_NAME)
+        
+        # Parse routes and prepare them
+        print("Parsing and preparing routes...")
+        routes = fmc.parse_and_prepare_routes(ROUTES_FILE)
+        
+        # Confirm deployment
+        pending = fmc.pending_hosts + fmc.pending_networks
+        if pending:
+            print("\nThe following objects were not found in FMC and will be created:")
+            for obj in pending:
+                print(f"  - {obj['type']}: {obj['name']} ({obj['value']})")
+            print(f"\nReady to create {len(pending)} objects and deploy {len(routes) + fmc.pending_routes} routes.")
+        else:
+            print(f"\nReady to deploy {len(routes)} routes.")
+        confirm = input("Do you want to proceed? (yes/no): ")
+        if confirm.lower() != 'yes':
+            print("Deployment cancelled.")
+            sys.exit(0)
+        
+        # Create missing objects, then include the routes that needed them
+        if pending:
+            routes = fmc.create_missing_objects()
+        
+        # Deploy routes
+        fmc.deploy_routes(routes)
+        
+        print("\nRoute deployment complete!")
+    finally:
+        fmc.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file